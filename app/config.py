@@ -2,7 +2,18 @@
 Configuration settings for SpamNoMore API
 """
 import os
-from typing import List
+from typing import Iterable, List, Tuple
+
+import ahocorasick
+
+
+def _build_keyword_automaton(keywords: Iterable[str]) -> ahocorasick.Automaton:
+    """Compile keywords into an Aho-Corasick automaton so text is scanned in a single pass."""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword.lower(), keyword)
+    automaton.make_automaton()
+    return automaton
 
 
 class Settings:
@@ -18,15 +29,21 @@ class Settings:
     CORS_ORIGINS: List[str] = CORS_ORIGINS_ENV.split(",") if CORS_ORIGINS_ENV != "*" else ["*"]
     
     # DNS Configuration
-    DNS_TIMEOUT: int = int(os.getenv("DNS_TIMEOUT", "5"))
+    # DNS_TIMEOUT bounds a single query attempt; DNS_LIFETIME bounds a lookup including retries
+    DNS_TIMEOUT: int = int(os.getenv("DNS_TIMEOUT", "2"))
+    DNS_RETRIES: int = int(os.getenv("DNS_RETRIES", "3"))
     DNS_LIFETIME: int = int(os.getenv("DNS_LIFETIME", "5"))
+    # "aiodns" (c-ares) or "dnspython"
+    DNS_BACKEND: str = os.getenv("DNS_BACKEND", "aiodns")
     
     # Scoring Configuration
-    SPAM_KEYWORDS: List[str] = [
+    # A tuple so the keyword list cannot drift from the automaton compiled from it
+    SPAM_KEYWORDS: Tuple[str, ...] = (
         'click here', 'act now', 'limited time', 'free money', 
         'nigerian prince', 'winner', 'congratulations', 'urgent',
         'cash bonus', 'risk-free', 'satisfaction guaranteed'
-    ]
+    )
+    SPAM_AUTOMATON: ahocorasick.Automaton = _build_keyword_automaton(SPAM_KEYWORDS)
     
     # Common DKIM selectors to check
     COMMON_DKIM_SELECTORS: List[str] = [
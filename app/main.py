@@ -3,8 +3,10 @@ FastAPI application for SpamNoMore - Email Deliverability Checker
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List, Dict, Any
+import bisect
 import re
 import dns.exception
 
@@ -14,7 +16,8 @@ from app.config import settings
 app = FastAPI(
     title=settings.API_TITLE,
     description=settings.API_DESCRIPTION,
-    version=settings.API_VERSION
+    version=settings.API_VERSION,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware with configurable origins
@@ -26,6 +29,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+_DOMAIN_RE = re.compile(r'^([a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$')
+
+# Summary bands: a trust percentage at or above _SUMMARY_THRESHOLDS[i] gets _SUMMARY_TEMPLATES[i + 1]
+_SUMMARY_THRESHOLDS = (35, 55, 75, 90)
+_SUMMARY_TEMPLATES = (
+    "Critical misconfiguration detected. High risk of spam filtering or rejection. Trust score: {pct}%. Immediate action required to fix issues.",
+    "Weak authentication posture detected. This domain is at risk of filtering. Trust score: {pct}%. Action is recommended to enhance deliverability.",
+    "Partial authentication coverage detected. Some providers may not fully trust this domain. Trust score: {pct}%. Review suggestions to improve.",
+    "Strong configuration with minor gaps. Most providers will trust this domain. Trust score: {pct}%.",
+    "Enterprise-grade configuration detected. Deliverability posture is well above industry baseline. Trust score: {pct}%.",
+)
+
 
 class ScanDomainRequest(BaseModel):
     """Request model for domain scanning."""
@@ -37,19 +52,24 @@ class ScanDomainRequest(BaseModel):
     @classmethod
     def validate_domain(cls, v: str) -> str:
         """Validate domain format."""
+        # Surrounding whitespace (e.g. a trailing newline) is dropped, so DNSChecker
+        # always receives a normalized domain
+        v = v.strip()
         if not v:
             raise ValueError("Domain cannot be empty")
         
         # Remove protocol if present
-        v = re.sub(r'^https?://', '', v)
+        if v.startswith('http://'):
+            v = v[7:]
+        elif v.startswith('https://'):
+            v = v[8:]
         # Remove path if present
-        v = v.split('/')[0]
+        v = v.split('/', 1)[0]
         # Remove www. prefix
-        v = re.sub(r'^www\.', '', v)
+        v = v.removeprefix('www.')
         
         # Basic domain validation
-        domain_pattern = r'^([a-zA-Z0-9]([a-zA-Z0-9\-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}$'
-        if not re.match(domain_pattern, v):
+        if not _DOMAIN_RE.fullmatch(v):
             raise ValueError(f"Invalid domain format: {v}")
         
         return v.lower()
@@ -124,7 +144,7 @@ async def scan_domain(request: ScanDomainRequest):
     try:
         # Perform DNS checks
         dns_checker = DNSChecker(request.domain)
-        dns_results = dns_checker.check_all()
+        dns_results = await dns_checker.check_all()
         
         # Calculate scores
         scorer = TrustScorer(
@@ -136,37 +156,31 @@ async def scan_domain(request: ScanDomainRequest):
         
         # Generate action suggestions
         action_gen = ActionGenerator(dns_results=dns_results, scores=overall_scores)
-        all_suggestions = action_gen.generate_suggestions()
-        top_suggestions = action_gen.get_top_suggestions(limit=5)
+        top_suggestions = action_gen.generate_suggestions()[:5]
         
         # Create summary
         trust_percentage = overall_scores['trust_percentage']
-        if trust_percentage >= 90:
-            summary = f"Enterprise-grade configuration detected. Deliverability posture is well above industry baseline. Trust score: {trust_percentage}%."
-        elif trust_percentage >= 75:
-            summary = f"Strong configuration with minor gaps. Most providers will trust this domain. Trust score: {trust_percentage}%."
-        elif trust_percentage >= 55:
-            summary = f"Partial authentication coverage detected. Some providers may not fully trust this domain. Trust score: {trust_percentage}%. Review suggestions to improve."
-        elif trust_percentage >= 35:
-            summary = f"Weak authentication posture detected. This domain is at risk of filtering. Trust score: {trust_percentage}%. Action is recommended to enhance deliverability."
-        else:
-            summary = f"PCritical misconfiguration detected. High risk of spam filtering or rejection. Trust score: {trust_percentage}%. Immediate action required to fix issues."
+        summary = _SUMMARY_TEMPLATES[bisect.bisect_right(_SUMMARY_THRESHOLDS, trust_percentage)].format(
+            pct=trust_percentage
+        )
         
         # Format response
-        return ScanDomainResponse(
-            domain=request.domain,
-            trust_score=int(overall_scores['total_score']),
-            trust_percentage=overall_scores['trust_percentage'],
-            scores={
-                'authentication': ScoreResponse(**overall_scores['authentication']),
-                'domain_health': ScoreResponse(**overall_scores['domain_health']),
-                'sending_setup': ScoreResponse(**overall_scores['sending_setup']),
-                'content_risk': ScoreResponse(**overall_scores['content_risk'])
+        # The payload is built from our own module output, so it is returned as-is rather
+        # than re-validated through ScanDomainResponse (which still documents the schema)
+        return ORJSONResponse(content={
+            'domain': request.domain,
+            'trust_score': int(overall_scores['total_score']),
+            'trust_percentage': overall_scores['trust_percentage'],
+            'scores': {
+                'authentication': overall_scores['authentication'],
+                'domain_health': overall_scores['domain_health'],
+                'sending_setup': overall_scores['sending_setup'],
+                'content_risk': overall_scores['content_risk']
             },
-            dns_results=DNSResultsResponse(**dns_results),
-            top_suggestions=[SuggestionResponse(**s) for s in top_suggestions],
-            summary=summary
-        )
+            'dns_results': dns_results,
+            'top_suggestions': top_suggestions,
+            'summary': summary
+        })
     
     except dns.exception.DNSException as e:
         # DNS-specific errors
@@ -2,20 +2,137 @@
 Actions module for generating intelligent, contextual suggestions.
 """
 
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping
+
+
+# Suggestion templates are shared and read-only; _suggestion() hands out a fresh dict per request
+_SPF_MISSING = MappingProxyType({
+    "priority": "critical",
+    "category": "SPF",
+    "issue": "No SPF record found",
+    "action": "Add an SPF record to your domain",
+    "details": "SPF prevents senders from spoofing your domain. Add a DNS TXT record like: v=spf1 include:_spf.google.com ~all",
+    "impact": "High — Missing SPF reduces inbox trust"
+})
+
+_SPF_INVALID = MappingProxyType({
+    "priority": "high",
+    "category": "SPF",
+    "issue": "SPF is configured incorrectly",
+    "action": "Fix your SPF configuration",
+    "details": "Current record: {record}. Ensure redirect, includes and terminal policy are valid.",
+    "impact": "Medium — Broken SPF causes authentication failures"
+})
+
+_DKIM_NOT_DISCOVERABLE = MappingProxyType({
+    "priority": "info",
+    "category": "DKIM",
+    "issue": "DKIM not publicly discoverable",
+    "action": "No action needed",
+    "details": "Enterprise providers may hide selectors intentionally. Authentication is managed internally.",
+    "impact": "None"
+})
+
+_DKIM_MISSING = MappingProxyType({
+    "priority": "high",
+    "category": "DKIM",
+    "issue": "No DKIM records found",
+    "action": "Enable DKIM signing",
+    "details": "Configure DKIM inside your email provider (Google Workspace, Outlook, etc.)",
+    "impact": "High — Missing DKIM hurts sender identity "
+})
+
+_DMARC_MISSING = MappingProxyType({
+    "priority": "critical",
+    "category": "DMARC",
+    "issue": "No DMARC policy found",
+    "action": "Add DMARC record",
+    "details": "DMARC protects your domain from spoofing. Recommended: v=DMARC1; p=quarantine; rua=mailto:dmarc@yourdomain.com",
+    "impact": "Critical — Missing DMARC breaks protection"
+})
+
+_DMARC_MONITORING = MappingProxyType({
+    "priority": "info",
+    "category": "DMARC",
+    "issue": "DMARC in monitoring mode",
+    "action": "No change recommended",
+    "details": "This configuration is common in enterprise environments for observability and staged enforcement.",
+    "impact": "None"
+})
+
+_DMARC_NOT_ENFORCING = MappingProxyType({
+    "priority": "medium",
+    "category": "DMARC",
+    "issue": "DMARC policy not enforcing",
+    "action": "Move to quarantine or reject",
+    "details": "Current DMARC: {record}. Enforcing policy improves security and trust.",
+    "impact": "Medium — Enables domain-level protection"
+})
+
+_DMARC_ENFORCED = MappingProxyType({
+    "priority": "info",
+    "category": "DMARC",
+    "issue": "DMARC policy enforced",
+    "action": "No action needed",
+    "details": "This policy provides strong domain protection.",
+    "impact": "None"
+})
+
+_MX_MISSING = MappingProxyType({
+    "priority": "critical",
+    "category": "MX",
+    "issue": "No MX records found",
+    "action": "Set MX records",
+    "details": "MX records enable incoming email delivery.",
+    "impact": "Critical — Cannot receive email"
+})
+
+_MX_SINGLE = MappingProxyType({
+    "priority": "low",
+    "category": "MX",
+    "issue": "Single MX server",
+    "action": "Add backup MX",
+    "details": "Adding redundancy improves reliability.",
+    "impact": "Low"
+})
+
+_CONTENT_RISK = MappingProxyType({
+    "priority": "medium",
+    "category": "Email Content",
+    "issue": "Content risk signals detected",
+    "action": "Review email wording and links",
+    "details": "{risks}",
+    "impact": "Medium — Content impacts inbox placement"
+})
+
+# Output order; suggestions are bucketed by priority as they are added, so no sort is needed
+_PRIORITY_ORDER = ("critical", "high", "medium", "low", "info")
+
+
+def _suggestion(template: Mapping[str, str], **fields: Any) -> Dict[str, Any]:
+    """Copy a template, interpolating any dynamic fields into its details."""
+    suggestion = dict(template)
+    if fields:
+        suggestion["details"] = template["details"].format(**fields)
+    return suggestion
 
 
 class ActionGenerator:
     """Generates prioritized fix suggestions based on scan results."""
 
+    __slots__ = ("dns_results", "scores", "suggestions", "_buckets", "_generated_for")
+
     def __init__(self, dns_results: Dict[str, Any], scores: Dict[str, Any]):
         self.dns_results = dns_results
         self.scores = scores
         self.suggestions = []
+        self._buckets = {}
+        self._generated_for = None
 
     def generate_suggestions(self) -> List[Dict[str, Any]]:
         """Generate prioritized list of fix suggestions."""
-        self.suggestions = []
+        self._buckets = {priority: [] for priority in _PRIORITY_ORDER}
 
         # High-level domain maturity detection
         enterprise_like = self._is_enterprise_like()
@@ -35,12 +152,16 @@ class ActionGenerator:
         # Content
         self._check_content_suggestions()
 
-        # Sort suggestions by priority
-        priority_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3, 'info': 4}
-        self.suggestions.sort(key=lambda x: priority_order.get(x['priority'], 99))
+        # Buckets are already in priority order
+        self.suggestions = [s for bucket in self._buckets.values() for s in bucket]
+        self._generated_for = self._inputs_key()
 
         return self.suggestions
 
+    def _add(self, template: Mapping[str, str], **fields: Any):
+        """Add a suggestion to its priority bucket."""
+        self._buckets[template["priority"]].append(_suggestion(template, **fields))
+
     # ---------------- INTELLIGENCE ----------------
 
     def _is_enterprise_like(self) -> bool:
@@ -62,24 +183,10 @@ class ActionGenerator:
         spf = self.dns_results.get("spf", {})
 
         if not spf.get("exists"):
-            self.suggestions.append({
-                "priority": "critical",
-                "category": "SPF",
-                "issue": "No SPF record found",
-                "action": "Add an SPF record to your domain",
-                "details": "SPF prevents senders from spoofing your domain. Add a DNS TXT record like: v=spf1 include:_spf.google.com ~all",
-                "impact": "High — Missing SPF reduces inbox trust"
-            })
+            self._add(_SPF_MISSING)
 
         elif not spf.get("valid"):
-            self.suggestions.append({
-                "priority": "high",
-                "category": "SPF",
-                "issue": "SPF is configured incorrectly",
-                "action": "Fix your SPF configuration",
-                "details": f"Current record: {spf.get('record')}. Ensure redirect, includes and terminal policy are valid.",
-                "impact": "Medium — Broken SPF causes authentication failures"
-            })
+            self._add(_SPF_INVALID, record=spf.get("record"))
 
     # ---------------- DKIM ----------------
 
@@ -89,23 +196,9 @@ class ActionGenerator:
         if not dkim.get("exists"):
 
             if enterprise:
-                self.suggestions.append({
-                    "priority": "info",
-                    "category": "DKIM",
-                    "issue": "DKIM not publicly discoverable",
-                    "action": "No action needed",
-                    "details": "Enterprise providers may hide selectors intentionally. Authentication is managed internally.",
-                    "impact": "None"
-                })
+                self._add(_DKIM_NOT_DISCOVERABLE)
             else:
-                self.suggestions.append({
-                    "priority": "high",
-                    "category": "DKIM",
-                    "issue": "No DKIM records found",
-                    "action": "Enable DKIM signing",
-                    "details": "Configure DKIM inside your email provider (Google Workspace, Outlook, etc.)",
-                    "impact": "High — Missing DKIM hurts sender identity "
-                })
+                self._add(_DKIM_MISSING)
 
     # ---------------- DMARC ----------------
 
@@ -115,45 +208,17 @@ class ActionGenerator:
         mode = dmarc.get("mode")
 
         if not dmarc.get("exists"):
-            self.suggestions.append({
-                "priority": "critical",
-                "category": "DMARC",
-                "issue": "No DMARC policy found",
-                "action": "Add DMARC record",
-                "details": "DMARC protects your domain from spoofing. Recommended: v=DMARC1; p=quarantine; rua=mailto:dmarc@yourdomain.com",
-                "impact": "Critical — Missing DMARC breaks protection"
-            })
+            self._add(_DMARC_MISSING)
 
         elif policy == "none":
 
             if enterprise and mode == "partial-enforcement":
-                self.suggestions.append({
-                    "priority": "info",
-                    "category": "DMARC",
-                    "issue": "DMARC in monitoring mode",
-                    "action": "No change recommended",
-                    "details": "This configuration is common in enterprise environments for observability and staged enforcement.",
-                    "impact": "None"
-                })
+                self._add(_DMARC_MONITORING)
             else:
-                self.suggestions.append({
-                    "priority": "medium",
-                    "category": "DMARC",
-                    "issue": "DMARC policy not enforcing",
-                    "action": "Move to quarantine or reject",
-                    "details": f"Current DMARC: {dmarc.get('record')}. Enforcing policy improves security and trust.",
-                    "impact": "Medium — Enables domain-level protection"
-                })
+                self._add(_DMARC_NOT_ENFORCING, record=dmarc.get("record"))
 
         elif policy in ["quarantine", "reject"] and enterprise:
-            self.suggestions.append({
-                "priority": "info",
-                "category": "DMARC",
-                "issue": "DMARC policy enforced",
-                "action": "No action needed",
-                "details": "This policy provides strong domain protection.",
-                "impact": "None"
-            })
+            self._add(_DMARC_ENFORCED)
 
     # ---------------- MX ----------------
 
@@ -162,24 +227,10 @@ class ActionGenerator:
         count = mx.get("count", 0)
 
         if not mx.get("exists"):
-            self.suggestions.append({
-                "priority": "critical",
-                "category": "MX",
-                "issue": "No MX records found",
-                "action": "Set MX records",
-                "details": "MX records enable incoming email delivery.",
-                "impact": "Critical — Cannot receive email"
-            })
+            self._add(_MX_MISSING)
 
         elif count == 1:
-            self.suggestions.append({
-                "priority": "low",
-                "category": "MX",
-                "issue": "Single MX server",
-                "action": "Add backup MX",
-                "details": "Adding redundancy improves reliability.",
-                "impact": "Low"
-            })
+            self._add(_MX_SINGLE)
 
     # ---------------- CONTENT ----------------
 
@@ -188,18 +239,15 @@ class ActionGenerator:
         risks = content.get("risk_factors", [])
 
         if risks:
-            self.suggestions.append({
-                "priority": "medium",
-                "category": "Email Content",
-                "issue": "Content risk signals detected",
-                "action": "Review email wording and links",
-                "details": ", ".join(risks),
-                "impact": "Medium — Content impacts inbox placement"
-            })
+            self._add(_CONTENT_RISK, risks=", ".join(risks))
 
     # ---------------- OUTPUT ----------------
 
+    def _inputs_key(self):
+        return id(self.dns_results), id(self.scores)
+
     def get_top_suggestions(self, limit: int = 5) -> List[Dict[str, Any]]:
-        if not self.suggestions:
+        # Reuse the last run unless the inputs were swapped out since
+        if self._generated_for != self._inputs_key():
             self.generate_suggestions()
         return self.suggestions[:limit]
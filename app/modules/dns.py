@@ -1,60 +1,138 @@
 """
 DNS lookup module for checking SPF, DKIM, DMARC, and MX records.
 """
+import asyncio
+import re
+from operator import itemgetter
+from types import MappingProxyType
+
 import dns.resolver
 import dns.exception
 from typing import Optional, Dict, List, Any
 
 from app.config import settings
+from app.modules import dns_backends, dns_cache
+from app.modules.dns_backends import DNSAnswer
 
 
-# Domains we NEVER treat like small businesses
-ENTERPRISE_DOMAINS = [
+# Domains we NEVER treat like small businesses (all two-label, see is_enterprise_domain)
+ENTERPRISE_DOMAINS = frozenset((
     "gmail.com", "google.com", "yahoo.com", "outlook.com", "hotmail.com", "icloud.com"
-]
-
-COMMON_DKIM_SELECTORS = [
+))
+
+# Well-known MX sets of the ENTERPRISE_DOMAINS apexes as (priority, exchange) pairs,
+# so scans of these domains skip the MX round trip. Subdomains still go to DNS.
+_ENTERPRISE_MX = MappingProxyType({
+    "gmail.com": (
+        (5, "gmail-smtp-in.l.google.com"),
+        (10, "alt1.gmail-smtp-in.l.google.com"),
+        (20, "alt2.gmail-smtp-in.l.google.com"),
+        (30, "alt3.gmail-smtp-in.l.google.com"),
+        (40, "alt4.gmail-smtp-in.l.google.com"),
+    ),
+    "google.com": ((10, "smtp.google.com"),),
+    "yahoo.com": (
+        (1, "mta5.am0.yahoodns.net"),
+        (1, "mta6.am0.yahoodns.net"),
+        (1, "mta7.am0.yahoodns.net"),
+    ),
+    "outlook.com": ((5, "outlook-com.olc.protection.outlook.com"),),
+    "hotmail.com": ((2, "hotmail-com.olc.protection.outlook.com"),),
+    "icloud.com": ((10, "mx01.mail.icloud.com"), (10, "mx02.mail.icloud.com")),
+})
+
+# An SPF record should have a qualified "all" term (-all, ~all, ?all, +all). Mechanisms after
+# it are never evaluated, but modifiers such as exp= may still follow it (RFC 7208 section 5.1)
+_SPF_ALL_RE = re.compile(r"(?:^|\s)[-~?+]all(?=\s|$)")
+
+COMMON_DKIM_SELECTORS = (
     "default", "google", "selector1", "selector2", "mail", "dkim", "email", "smtp", "mx"
-]
+)
+
+# Results for missing records and DNS errors; returned as shallow copies, so nested
+# values are immutable tuples
+_SPF_MISSING = MappingProxyType({"exists": False, "record": None, "valid": False, "notes": ("No SPF record found",)})
+_SPF_ERROR = MappingProxyType({"exists": False, "record": None, "valid": False, "notes": ("DNS error while fetching SPF",)})
+_DMARC_MISSING = MappingProxyType({"exists": False, "record": None, "policy": None, "mode": "missing", "valid": False})
+_DMARC_ERROR = MappingProxyType({"exists": False, "record": None, "policy": None, "mode": "error", "valid": False})
+_DKIM_MISSING = MappingProxyType({"exists": False, "records": (), "valid": False, "notes": ("No DKIM selectors found",)})
+_MX_MISSING = MappingProxyType({"exists": False, "records": (), "count": 0, "valid": False})
+
+# Lookup failures the checks report as a missing or errored record rather than failing the
+# scan. NoNameservers covers SERVFAIL and unusable servers; OSError covers a backend failing
+# below the DNS layer.
+_LOOKUP_ERRORS = (
+    dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.Timeout, dns.resolver.NoNameservers, OSError
+)
+
+# Selected once at import; each query is a single attempt, retried by DNSChecker
+_BACKEND = dns_backends.get_backend(settings.DNS_BACKEND, timeout=settings.DNS_TIMEOUT)
+
+# "tag=value" pairs of a DMARC record, with surrounding whitespace trimmed
+_DMARC_TAG_RE = re.compile(r"(?:^|;)\s*([a-z]+)\s*=\s*([^;]*?)\s*(?=;|$)")
+
+
+def _parse_dmarc(record: str) -> Dict[str, str]:
+    """Split a DMARC record into a lowercased {tag: value} dict in one pass."""
+    # Reversed so the first occurrence of a repeated tag wins
+    return dict(reversed(_DMARC_TAG_RE.findall(record.lower())))
 
 
 class DNSChecker:
     """Handles DNS lookups for email authentication records."""
 
+    __slots__ = ("domain", "timeout", "lifetime")
+
     def __init__(self, domain: str, timeout: Optional[int] = None, lifetime: Optional[int] = None):
-        self.domain = domain.lower().strip()
-        self.resolver = dns.resolver.Resolver()
-        self.resolver.timeout = timeout if timeout is not None else settings.DNS_TIMEOUT
-        self.resolver.lifetime = lifetime if lifetime is not None else settings.DNS_LIFETIME
+        # Callers pass an already-normalized domain (ScanDomainRequest.validate_domain lowercases it)
+        assert domain == domain.lower().strip(), f"domain must be normalized, got {domain!r}"
+        self.domain = domain
+        self.timeout = timeout if timeout is not None else settings.DNS_TIMEOUT
+        self.lifetime = lifetime if lifetime is not None else settings.DNS_LIFETIME
+
+    async def _resolve(self, name: str, rdtype: str) -> DNSAnswer:
+        """Resolve through the shared TTL cache."""
+        return await dns_cache.cached_resolve(name, rdtype, lambda: self._resolve_with_retry(name, rdtype))
+
+    async def _resolve_with_retry(self, name: str, rdtype: str) -> DNSAnswer:
+        """Retry timed-out queries, giving up once the lifetime budget is spent."""
+        lookup = _BACKEND.mx if rdtype == "MX" else _BACKEND.txt
+
+        async def attempt():
+            for retries_left in range(settings.DNS_RETRIES, -1, -1):
+                try:
+                    return await lookup(name, self.timeout)
+                except dns.exception.Timeout:
+                    if not retries_left:
+                        raise
 
-        # Use stable public DNS for higher reliability
-        self.resolver.nameservers = ["8.8.8.8", "1.1.1.1"]
+        try:
+            return await asyncio.wait_for(attempt(), timeout=self.lifetime)
+        except asyncio.TimeoutError:
+            raise dns.exception.Timeout(timeout=self.lifetime)
 
     def is_enterprise_domain(self) -> bool:
-        return any(self.domain.endswith(ent) for ent in ENTERPRISE_DOMAINS)
+        # Match the domain or any subdomain of it with one hash lookup on the last two labels
+        return ".".join(self.domain.rsplit(".", 2)[-2:]) in ENTERPRISE_DOMAINS
 
     # ---------------- SPF ------------------
 
-    def check_spf(self) -> Dict[str, Any]:
+    async def check_spf(self) -> Dict[str, Any]:
         """Check SPF record."""
 
         try:
-            txt_records = self.resolver.resolve(self.domain, 'TXT')
-            spf_record = None
+            txt_records = await self._resolve(self.domain, 'TXT')
 
-            for record in txt_records:
-                txt_value = record.to_text().strip('"')
-                if txt_value.lower().startswith('v=spf1'):
-                    spf_record = txt_value
-                    break
+            # Match on raw bytes and only decode the record we keep
+            spf_record = next((t for t in txt_records.records if t[:6].lower() == b"v=spf1"), None)
 
-            if not spf_record:
-                return {"exists": False, "record": None, "valid": False, "notes": ["No SPF record found"]}
+            if spf_record is None:
+                return dict(_SPF_MISSING)
 
-            return self._evaluate_spf(spf_record)
+            return self._evaluate_spf(spf_record.decode("utf-8", "replace"))
 
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.Timeout):
-            return {"exists": False, "record": None, "valid": False, "notes": ["DNS error while fetching SPF"]}
+        except _LOOKUP_ERRORS:
+            return dict(_SPF_ERROR)
 
     def _evaluate_spf(self, record: str) -> Dict[str, Any]:
         result = {"exists": True, "record": record, "valid": True, "notes": []}
@@ -69,7 +147,7 @@ class DNSChecker:
             result["notes"].append("Redirect-based SPF detected (valid)")
             return result
 
-        if not any(x in r for x in ["-all", "~all", "?all", "+all"]):
+        if not _SPF_ALL_RE.search(r):
             result["valid"] = False
             result["notes"].append("Missing terminal qualifier (-all, ~all, etc.)")
 
@@ -77,52 +155,42 @@ class DNSChecker:
 
     # ---------------- DMARC ------------------
 
-    def check_dmarc(self) -> Dict[str, Any]:
+    async def check_dmarc(self) -> Dict[str, Any]:
         """Check DMARC record."""
 
         dmarc_domain = f"_dmarc.{self.domain}"
 
         try:
-            txt_records = self.resolver.resolve(dmarc_domain, "TXT")
-            dmarc_record = None
-
-            for record in txt_records:
-                txt = record.to_text().strip('"')
-                if txt.lower().startswith("v=dmarc1"):
-                    dmarc_record = txt
-                    break
+            txt_records = await self._resolve(dmarc_domain, "TXT")
+            dmarc_record = next((t for t in txt_records.records if t[:8].lower() == b"v=dmarc1"), None)
 
-            if not dmarc_record:
-                return {"exists": False, "record": None, "policy": None, "mode": "missing", "valid": False}
+            if dmarc_record is None:
+                return dict(_DMARC_MISSING)
 
-            return self._interpret_dmarc(dmarc_record)
+            return self._interpret_dmarc(dmarc_record.decode("utf-8", "replace"))
 
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.Timeout):
-            return {"exists": False, "record": None, "policy": None, "mode": "error", "valid": False}
+        except _LOOKUP_ERRORS:
+            return dict(_DMARC_ERROR)
 
     def _interpret_dmarc(self, record: str) -> Dict[str, Any]:
-        r = record.lower()
+        tags = _parse_dmarc(record)
 
         result = {
             "exists": True,
             "record": record,
             "policy": None,
             "mode": "unknown",
+            "rua": None,
             "valid": True,
             "notes": []
         }
 
-        def extract(key: str):
-            for part in r.split(";"):
-                if part.strip().startswith(key + "="):
-                    return part.split("=")[1].strip()
-            return None
-
-        p = extract("p")
-        sp = extract("sp")
-        rua = extract("rua")
+        p = tags.get("p")
+        sp = tags.get("sp")
+        rua = tags.get("rua")
 
         result["policy"] = p
+        result["rua"] = rua
 
         if p == "reject":
             result["mode"] = "strict"
@@ -143,8 +211,12 @@ class DNSChecker:
 
     # ---------------- DKIM ------------------
 
-    def check_dkim(self) -> Dict[str, Any]:
-        """Check DKIM safely using common selectors."""
+    async def check_dkim(self, early_exit: bool = True) -> Dict[str, Any]:
+        """
+        Check DKIM safely using common selectors.
+        With early_exit (the default) the sweep stops at the first selector publishing a key;
+        otherwise every selector is collected.
+        """
 
         # Enterprise domains are presumed managed
         if self.is_enterprise_domain():
@@ -155,63 +227,95 @@ class DNSChecker:
                 "notes": ["Known enterprise provider"]
             }
 
-        selectors = COMMON_DKIM_SELECTORS
+        # Probe all selectors concurrently, in completion order
+        tasks = [asyncio.create_task(self._probe_dkim_selector(selector)) for selector in COMMON_DKIM_SELECTORS]
         found_records = []
-
-        for selector in selectors:
-            try:
-                dkim_domain = f"{selector}._domainkey.{self.domain}"
-                answers = self.resolver.resolve(dkim_domain, "TXT")
-
-                for rdata in answers:
-                    txt_value = rdata.to_text().strip('"').lower()
-                    if "v=dkim1" in txt_value and "p=" in txt_value:
-                        found_records.append({
-                            "selector": selector,
-                            "record": rdata.to_text().strip('"')
-                        })
-            except Exception:
-                continue
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                found_records.extend(await next_done)
+                if found_records and early_exit:
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
 
         if found_records:
             return {"exists": True, "records": found_records, "valid": True}
 
-        return {"exists": False, "records": [], "valid": False, "notes": ["No DKIM selectors found"]}
+        return dict(_DKIM_MISSING)
 
-    # ---------------- MX ------------------
-
-    def check_mx(self) -> Dict[str, Any]:
-        """Check MX records"""
+    async def _probe_dkim_selector(self, selector: str) -> List[Dict[str, str]]:
+        """Return the DKIM key records published under one selector."""
 
         try:
-            answers = self.resolver.resolve(self.domain, 'MX')
-            records = []
+            answers = await self._resolve(f"{selector}._domainkey.{self.domain}", "TXT")
+        except _LOOKUP_ERRORS:
+            # Most selectors don't exist; a failure on one shouldn't sink the sweep either
+            return []
 
-            for mx in answers:
-                records.append({
-                    "priority": mx.preference,
-                    "server": str(mx.exchange).rstrip(".")
+        found_records = []
+        for txt_value in answers.records:
+            lowered = txt_value.lower()
+            if b"v=dkim1" in lowered and b"p=" in lowered:
+                found_records.append({
+                    "selector": selector,
+                    "record": txt_value.decode("utf-8", "replace")
                 })
 
-            records.sort(key=lambda x: x["priority"])
+        return found_records
 
-            return {
-                "exists": len(records) > 0,
-                "records": records,
-                "count": len(records),
-                "valid": len(records) > 0
-            }
+    # ---------------- MX ------------------
 
-        except Exception:
-            return {"exists": False, "records": [], "count": 0, "valid": False}
+    async def check_mx(self) -> Dict[str, Any]:
+        """Check MX records"""
+
+        mx_pairs = _ENTERPRISE_MX.get(self.domain)
+
+        if mx_pairs is None:
+            try:
+                answers = await self._resolve(self.domain, 'MX')
+            except _LOOKUP_ERRORS:
+                return dict(_MX_MISSING)
+            mx_pairs = answers.records
+
+        # Sort the (priority, server) pairs on priority alone so ties keep answer order
+        records = [
+            {"priority": priority, "server": server}
+            for priority, server in sorted(mx_pairs, key=itemgetter(0))
+        ]
+
+        return {
+            "exists": len(records) > 0,
+            "records": records,
+            "count": len(records),
+            "valid": len(records) > 0
+        }
 
     # ---------------- ALL ------------------
 
-    def check_all(self) -> Dict[str, Any]:
-        """Run all DNS checks"""
+    async def check_all(self) -> Dict[str, Any]:
+        """Run all DNS checks concurrently"""
+        spf, dmarc, dkim, mx = await asyncio.gather(
+            self.check_spf(),
+            self.check_dmarc(),
+            self.check_dkim(),
+            self.check_mx()
+        )
         return {
-            "spf": self.check_spf(),
-            "dmarc": self.check_dmarc(),
-            "dkim": self.check_dkim(),
-            "mx": self.check_mx()
+            "spf": spf,
+            "dmarc": dmarc,
+            "dkim": dkim,
+            "mx": mx
         }
+
+    def check_all_sync(self) -> Dict[str, Any]:
+        """Blocking wrapper around check_all() for callers outside an event loop."""
+
+        async def run():
+            try:
+                return await self.check_all()
+            finally:
+                # The loop ends with this call, so release the backend sockets bound to it
+                _BACKEND.close()
+
+        return asyncio.run(run())
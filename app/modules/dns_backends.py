@@ -0,0 +1,270 @@
+"""
+DNS client backends used by DNSChecker.
+
+Each backend makes a single query attempt and raises dnspython's exceptions, so
+retries, caching and the check_* error handling work the same whichever is used.
+"""
+import asyncio
+import itertools
+import socket
+import threading
+import warnings
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import dns.asyncquery
+import dns.entropy
+import dns.exception
+import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.resolver
+
+try:
+    import aiodns
+except ImportError:  # aiodns is optional; dnspython is always available
+    aiodns = None
+
+
+# Stable public DNS for higher reliability
+NAMESERVERS = ("8.8.8.8", "1.1.1.1")
+
+
+class DNSAnswer(NamedTuple):
+    """
+    Backend-neutral lookup result.
+    TXT records are raw bytes with their character-strings joined; MX records are
+    (priority, exchange) pairs. ttl is None when the backend does not report one.
+    """
+    records: List[Any]
+    ttl: Optional[int]
+
+
+# A shared socket is swapped for a fresh one after this many queries or seconds, so the
+# source port keeps changing and a forged reply needs more than the 16-bit query id
+UDP_SOCKET_MAX_QUERIES = 100
+UDP_SOCKET_MAX_AGE = 10.0
+
+
+class _UDPMultiplexer:
+    """
+    One non-blocking UDP socket shared by every in-flight dnspython query on an event loop.
+    Replies are routed back to their waiter by (server, query id) and must echo the
+    question; anything else is dropped and the waiting query keeps listening.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.created = loop.time()
+        self.queries = 0
+        self._retired = False
+        self._pending: Dict[Tuple[str, int], Tuple[dns.message.Message, asyncio.Future]] = {}
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self._sock.setblocking(False)
+            self._sock.bind(("0.0.0.0", 0))
+            loop.add_reader(self._sock.fileno(), self._read_ready)
+        except BaseException:
+            self._sock.close()
+            raise
+
+    def _read_ready(self):
+        while True:
+            try:
+                data, addr = self._sock.recvfrom(65535)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # ICMP errors can't be tied to a query; it runs into its timeout instead
+                return
+            self._dispatch(data, addr)
+
+    def _dispatch(self, data: bytes, addr: Tuple[str, int]):
+        waiter = self._pending.get((addr[0], int.from_bytes(data[:2], "big")))
+        if waiter is None:
+            return
+        request, future = waiter
+        try:
+            response = dns.message.from_wire(data, keyring=request.keyring, request_mac=request.request_mac)
+        except Exception:
+            return
+        if request.is_response(response) and not future.done():
+            future.set_result(response)
+
+    def is_stale(self) -> bool:
+        return self.queries >= UDP_SOCKET_MAX_QUERIES or self.loop.time() - self.created >= UDP_SOCKET_MAX_AGE
+
+    def retire(self):
+        """Take no new queries and close once the in-flight ones finish."""
+        self._retired = True
+        if not self._pending:
+            self.close()
+
+    def close(self):
+        """Close the socket, failing any query still waiting on it."""
+        if self._sock.fileno() < 0:
+            return
+        # A loop that has already shut down (check_all_sync) has no reader or waiters left
+        if not self.loop.is_closed():
+            self.loop.remove_reader(self._sock.fileno())
+            for _, future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("DNS socket closed"))
+        self._sock.close()
+
+    async def query(self, request: dns.message.Message, where: str, port: int, timeout: float) -> dns.message.Message:
+        # Query ids only have to be unique per server among the queries in flight
+        while (where, request.id) in self._pending:
+            request.id = dns.entropy.random_16()
+
+        key = (where, request.id)
+        future = self.loop.create_future()
+        self._pending[key] = (request, future)
+        self.queries += 1
+        try:
+            self._sock.sendto(request.to_wire(), (where, port))
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            raise dns.exception.Timeout(timeout=timeout)
+        finally:
+            del self._pending[key]
+            if self._retired and not self._pending:
+                self.close()
+
+
+class DNSPythonBackend:
+    """
+    Sends each query straight to the pinned recursive resolvers as a single message,
+    skipping the stub Resolver's per-query state machine, so a burst such as the DKIM
+    selector sweep goes out back to back. Queries share one UDP socket per event loop
+    instead of opening a socket each, rotated every UDP_SOCKET_MAX_QUERIES queries or
+    UDP_SOCKET_MAX_AGE seconds. Successive queries (and so retries) alternate
+    between nameservers; truncated answers are retried over TCP.
+    """
+
+    def __init__(self, nameservers: Sequence[str] = NAMESERVERS, port: int = 53):
+        self._nameservers = itertools.cycle(nameservers)
+        self._port = port
+        self._local = threading.local()
+
+    def _multiplexer(self) -> _UDPMultiplexer:
+        # Kept per thread. A socket left by a previous loop (check_all_sync) is closed here; a
+        # stale one is retired, finishing its in-flight queries while new ones use a fresh port.
+        loop = asyncio.get_running_loop()
+        multiplexer = getattr(self._local, "multiplexer", None)
+        if multiplexer is None or multiplexer.loop is not loop or multiplexer.is_stale():
+            if multiplexer is not None:
+                multiplexer.retire()
+            multiplexer = _UDPMultiplexer(loop)
+            self._local.multiplexer = multiplexer
+        return multiplexer
+
+    def close(self):
+        """Close this thread's shared socket; the next query opens a new one."""
+        multiplexer = getattr(self._local, "multiplexer", None)
+        if multiplexer is not None:
+            multiplexer.close()
+            self._local.multiplexer = None
+
+    async def _query(self, name: str, rdtype: str, timeout: float):
+        request = dns.message.make_query(name, rdtype, use_edns=0, payload=1232)
+        where = next(self._nameservers)
+        try:
+            response = await self._multiplexer().query(request, where, self._port, timeout)
+            if response.flags & dns.flags.TC:
+                response = await dns.asyncquery.tcp(request, where, timeout=timeout, port=self._port)
+        except dns.exception.Timeout:
+            raise
+        except (OSError, EOFError, dns.exception.DNSException) as e:
+            # Socket failures, a dropped TCP fallback or a malformed reply: the server
+            # is unusable for this query, as the stub Resolver reported it
+            raise dns.resolver.NoNameservers() from e
+
+        rcode = response.rcode()
+        if rcode == dns.rcode.NXDOMAIN:
+            raise dns.resolver.NXDOMAIN(qnames=[request.question[0].name])
+        if rcode != dns.rcode.NOERROR:
+            raise dns.resolver.NoNameservers()
+
+        chain = response.resolve_chaining()
+        if chain.answer is None:
+            raise dns.resolver.NoAnswer(response=response)
+        return chain
+
+    async def txt(self, name: str, timeout: float) -> DNSAnswer:
+        chain = await self._query(name, "TXT", timeout)
+        return DNSAnswer([b"".join(rdata.strings) for rdata in chain.answer], chain.minimum_ttl)
+
+    async def mx(self, name: str, timeout: float) -> DNSAnswer:
+        chain = await self._query(name, "MX", timeout)
+        return DNSAnswer(
+            [(mx.preference, str(mx.exchange).rstrip(".")) for mx in chain.answer],
+            chain.minimum_ttl
+        )
+
+
+class AioDNSBackend:
+    """
+    Resolves through c-ares, which keeps its UDP sockets open and multiplexes queries
+    over them. A c-ares channel is bound to an event loop, so one is created lazily on
+    the loop serving requests, and kept per thread so check_all_sync() callers in a
+    thread pool don't share one.
+    """
+
+    def __init__(self, nameservers: Sequence[str] = NAMESERVERS, timeout: float = 2):
+        self._nameservers = list(nameservers)
+        self._timeout = timeout
+        self._local = threading.local()
+        self._errors = {
+            aiodns.error.ARES_ENOTFOUND: dns.resolver.NXDOMAIN,
+            aiodns.error.ARES_ENODATA: dns.resolver.NoAnswer,
+            aiodns.error.ARES_ETIMEOUT: dns.exception.Timeout,
+        }
+
+    def _resolver(self) -> "aiodns.DNSResolver":
+        loop = asyncio.get_running_loop()
+        resolver = getattr(self._local, "resolver", None)
+        if resolver is None or resolver.loop is not loop:
+            resolver = aiodns.DNSResolver(nameservers=self._nameservers, loop=loop, timeout=self._timeout, tries=1)
+            self._local.resolver = resolver
+        return resolver
+
+    def close(self):
+        """Drop this thread's c-ares channel, cancelling its outstanding queries."""
+        resolver = getattr(self._local, "resolver", None)
+        if resolver is not None:
+            resolver.cancel()
+            self._local.resolver = None
+
+    async def _query(self, name: str, rdtype: str, timeout: float):
+        try:
+            return await asyncio.wait_for(self._resolver().query(name, rdtype), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise dns.exception.Timeout(timeout=timeout)
+        except aiodns.error.DNSError as e:
+            error = self._errors.get(e.args[0] if e.args else None, dns.resolver.NoNameservers)
+            if error is dns.resolver.NXDOMAIN:
+                raise error(qnames=[dns.name.from_text(name)])
+            raise error()
+
+    # pycares does not expose record TTLs here, so the cache falls back to its default
+
+    async def txt(self, name: str, timeout: float) -> DNSAnswer:
+        result = await self._query(name, "TXT", timeout)
+        return DNSAnswer([r.text.encode() if isinstance(r.text, str) else r.text for r in result], None)
+
+    async def mx(self, name: str, timeout: float) -> DNSAnswer:
+        result = await self._query(name, "MX", timeout)
+        return DNSAnswer([(mx.priority, mx.host.rstrip(".")) for mx in result], None)
+
+
+def get_backend(name: str, timeout: float):
+    """Build the backend named by DNS_BACKEND, falling back to dnspython without aiodns."""
+    if name == "aiodns":
+        if aiodns is not None:
+            return AioDNSBackend(timeout=timeout)
+        warnings.warn("DNS_BACKEND is 'aiodns' but aiodns is not installed; using dnspython")
+        return DNSPythonBackend()
+    if name == "dnspython":
+        return DNSPythonBackend()
+    raise ValueError(f"Unknown DNS_BACKEND {name!r}, expected 'aiodns' or 'dnspython'")
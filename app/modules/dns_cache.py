@@ -0,0 +1,100 @@
+"""
+Process-wide TTL cache for DNS answers, shared by every DNSChecker.
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+
+import dns.resolver
+from cachetools import TLRUCache
+
+
+CACHE_MAX_SIZE = 10_000
+DEFAULT_TTL = 300
+MIN_TTL = 60
+MAX_TTL = 3600
+
+# Negative answers are cached too; they are what repeat scans of broken domains hit most
+NEGATIVE_ERRORS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer)
+
+CacheKey = Tuple[str, str]
+LockKey = Tuple[asyncio.AbstractEventLoop, CacheKey]
+
+
+class _Entry:
+    """
+    A cached answer, or the negative-answer exception type to raise afresh on each hit.
+    Only the type and qnames are kept: a caught instance would pin the frames of the
+    lookup that raised it, and one shared instance would be re-raised across tasks.
+    """
+
+    __slots__ = ("answer", "error", "qnames", "ttl")
+
+    def __init__(self, ttl: int, answer: Any = None, error: Optional[Type[Exception]] = None,
+                 qnames: Optional[List[Any]] = None):
+        self.ttl = ttl
+        self.answer = answer
+        self.error = error
+        self.qnames = qnames
+
+
+_cache: TLRUCache = TLRUCache(maxsize=CACHE_MAX_SIZE, ttu=lambda key, entry, now: now + entry.ttl)
+
+# TLRUCache is not thread-safe, and check_all_sync() callers may run scans from a thread pool
+_cache_lock = threading.Lock()
+
+# One lock per in-flight key so concurrent misses on the same name trigger a single lookup.
+# asyncio locks belong to one event loop, so they are keyed by loop as well.
+_locks: Dict[LockKey, asyncio.Lock] = {}
+
+
+def _get(key: CacheKey) -> Optional[_Entry]:
+    with _cache_lock:
+        return _cache.get(key)
+
+
+def _set(key: CacheKey, entry: _Entry) -> None:
+    with _cache_lock:
+        _cache[key] = entry
+
+
+def _answer_ttl(answer: Any) -> int:
+    """Use the record TTL when the answer carries one, clamped to sane bounds."""
+    ttl = getattr(answer, "ttl", None)
+    if ttl is None or ttl < 0:
+        return DEFAULT_TTL
+    return max(MIN_TTL, min(MAX_TTL, ttl))
+
+
+async def cached_resolve(name: str, rdtype: str, lookup: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached answer for (name, rdtype), calling lookup() on a miss."""
+    key = (name.lower(), rdtype)
+
+    entry = _get(key)
+    if entry is None:
+        lock_key = (asyncio.get_running_loop(), key)
+        lock = _locks.setdefault(lock_key, asyncio.Lock())
+        try:
+            async with lock:
+                entry = _get(key)
+                if entry is None:
+                    try:
+                        answer = await lookup()
+                    except NEGATIVE_ERRORS as e:
+                        entry = _Entry(DEFAULT_TTL, error=type(e), qnames=e.kwargs.get("qnames"))
+                    else:
+                        entry = _Entry(_answer_ttl(answer), answer=answer)
+                    _set(key, entry)
+        finally:
+            if _locks.get(lock_key) is lock:
+                del _locks[lock_key]
+
+    if entry.error is not None:
+        raise entry.error(qnames=entry.qnames) if entry.qnames else entry.error()
+    return entry.answer
+
+
+def clear() -> None:
+    """Drop every cached answer."""
+    with _cache_lock:
+        _cache.clear()
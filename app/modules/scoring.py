@@ -3,18 +3,83 @@ Scoring module for calculating trust scores based on DNS checks and email analys
 This version emphasizes protocol correctness and realistic weighting.
 """
 
+import re
 from typing import Dict, Any, Optional
 from app.config import settings
 
 
+# Authentication-Results failures; one scan finds all of them
+_AUTH_FAIL_RE = re.compile(r"(spf|dkim|dmarc)=fail")
+
+# Bound once at import; the automaton is compiled from settings.SPAM_KEYWORDS
+_SPAM_AUTOMATON = settings.SPAM_AUTOMATON
+
+# Authentication rules as data: (predicate, points, detail) per component.
+# The first matching rule in each group applies.
+_AUTH_RULES = (
+    # SPF (15)
+    (
+        (lambda s: s._spf_exists and s._spf_valid, 15, "SPF correctly configured"),
+        (lambda s: s._spf_exists, 8, "SPF exists but may be malformed"),
+        (lambda s: True, 0, "SPF missing"),
+    ),
+    # DKIM (10)
+    (
+        (lambda s: s._dkim_exists and s._dkim_valid, 10, "DKIM signing detected"),
+        (lambda s: True, 0, "DKIM not detected"),
+    ),
+    # DMARC (15)
+    (
+        (lambda s: not s._dmarc_exists, 0, "DMARC missing"),
+        (lambda s: s._dmarc_policy == "reject", 15, "DMARC enforcing (reject)"),
+        (lambda s: s._dmarc_policy == "quarantine", 12, "DMARC enforcing (quarantine)"),
+        (lambda s: s._dmarc_mode == "partial-enforcement", 10, "DMARC partial enforcement (subdomains protected)"),
+        (lambda s: s._dmarc_policy == "none", 7, "DMARC monitoring only"),
+        (lambda s: True, 4, "Weak DMARC configuration"),
+    ),
+)
+
+
 class TrustScorer:
     """Calculates trust scores for email deliverability based on DNS and content analysis."""
 
+    __slots__ = (
+        "dns_results", "headers", "body",
+        "_spf_exists", "_spf_valid", "_dkim_exists", "_dkim_valid",
+        "_dmarc_exists", "_dmarc_policy", "_dmarc_mode", "_mx_count",
+    )
+
+    # Pillar maxima, with percentage multipliers precomputed (100 / max)
+    _AUTH_MAX = 40
+    _AUTH_INV = 100.0 / _AUTH_MAX
+    _DOMAIN_MAX = 20
+    _DOMAIN_INV = 100.0 / _DOMAIN_MAX
+    _SENDING_MAX = 20
+    _SENDING_INV = 100.0 / _SENDING_MAX
+    _CONTENT_MAX = 20
+    _CONTENT_INV = 100.0 / _CONTENT_MAX
+
+    _TOTAL_MAX = _AUTH_MAX + _DOMAIN_MAX + _SENDING_MAX + _CONTENT_MAX
+    _TOTAL_INV = 100.0 / _TOTAL_MAX
+
     def __init__(self, dns_results: Dict[str, Any], headers: Optional[str] = None, body: Optional[str] = None):
         self.dns_results = dns_results
         self.headers = headers
         self.body = body
 
+        # Flatten the DNS fields the score methods read, once per scorer
+        spf = dns_results.get("spf", {})
+        dkim = dns_results.get("dkim", {})
+        dmarc = dns_results.get("dmarc", {})
+        self._spf_exists = bool(spf.get("exists"))
+        self._spf_valid = bool(spf.get("valid"))
+        self._dkim_exists = bool(dkim.get("exists"))
+        self._dkim_valid = bool(dkim.get("valid"))
+        self._dmarc_exists = bool(dmarc.get("exists"))
+        self._dmarc_policy = dmarc.get("policy")
+        self._dmarc_mode = dmarc.get("mode")
+        self._mx_count = dns_results.get("mx", {}).get("count", 0)
+
     # ---------------- AUTHENTICATION ------------------
 
     def calculate_authentication_score(self) -> Dict[str, Any]:
@@ -24,57 +89,19 @@ class TrustScorer:
         """
         score = 0
         details = []
-        max_score = 40
-
-        spf = self.dns_results.get("spf", {})
-        dkim = self.dns_results.get("dkim", {})
-        dmarc = self.dns_results.get("dmarc", {})
-
-        # SPF (15)
-        if spf.get("exists"):
-            if spf.get("valid"):
-                score += 15
-                details.append("SPF correctly configured")
-            else:
-                score += 8
-                details.append("SPF exists but may be malformed")
-        else:
-            details.append("SPF missing")
+        max_score = self._AUTH_MAX
 
-        # DKIM (10)
-        if dkim.get("exists") and dkim.get("valid"):
-            score += 10
-            details.append("DKIM signing detected")
-        else:
-            details.append("DKIM not detected")
-
-        # DMARC (15)
-        if dmarc.get("exists"):
-            mode = dmarc.get("mode")
-            policy = dmarc.get("policy")
-
-            if policy == "reject":
-                score += 15
-                details.append("DMARC enforcing (reject)")
-            elif policy == "quarantine":
-                score += 12
-                details.append("DMARC enforcing (quarantine)")
-            elif mode == "partial-enforcement":
-                score += 10
-                details.append("DMARC partial enforcement (subdomains protected)")
-            elif policy == "none":
-                score += 7
-                details.append("DMARC monitoring only")
-            else:
-                score += 4
-                details.append("Weak DMARC configuration")
-        else:
-            details.append("DMARC missing")
+        for rules in _AUTH_RULES:
+            for applies, points, detail in rules:
+                if applies(self):
+                    score += points
+                    details.append(detail)
+                    break
 
         return {
             "score": score,
             "max_score": max_score,
-            "percentage": round((score / max_score) * 100, 1),
+            "percentage": round(score * self._AUTH_INV, 1),
             "details": details
         }
 
@@ -87,16 +114,14 @@ class TrustScorer:
         """
         score = 0
         details = []
-        max_score = 20
+        max_score = self._DOMAIN_MAX
 
-        spf = self.dns_results.get("spf", {}).get("exists")
-        dkim = self.dns_results.get("dkim", {}).get("exists")
-        dmarc = self.dns_results.get("dmarc", {}).get("exists")
-        dmarc_mode = self.dns_results.get("dmarc", {}).get("mode")
-        dmarc_policy = self.dns_results.get("dmarc", {}).get("policy")
+        dmarc_mode = self._dmarc_mode
+        dmarc_policy = self._dmarc_policy
 
-        complete = all([spf, dkim, dmarc])
-        partial = sum([spf, dkim, dmarc])
+        layers = (self._spf_exists, self._dkim_exists, self._dmarc_exists)
+        complete = all(layers)
+        partial = sum(layers)
 
         # Structural strength
         if complete:
@@ -125,7 +150,7 @@ class TrustScorer:
         return {
             "score": score,
             "max_score": max_score,
-            "percentage": round((score / max_score) * 100, 1),
+            "percentage": round(score * self._DOMAIN_INV, 1),
             "details": details
         }
 
@@ -138,10 +163,9 @@ class TrustScorer:
         """
         score = 0
         details = []
-        max_score = 20
+        max_score = self._SENDING_MAX
 
-        mx = self.dns_results.get("mx", {})
-        count = mx.get("count", 0)
+        count = self._mx_count
 
         if count >= 5:
             score += 20
@@ -158,7 +182,7 @@ class TrustScorer:
         return {
             "score": score,
             "max_score": max_score,
-            "percentage": round((score / max_score) * 100, 1),
+            "percentage": round(score * self._SENDING_INV, 1),
             "details": details
         }
 
@@ -173,7 +197,7 @@ class TrustScorer:
         score = 20
         deductions = []
         details = []
-        max_score = 20
+        max_score = self._CONTENT_MAX
 
         # Header inspection
         if self.headers:
@@ -184,18 +208,18 @@ class TrustScorer:
                 score -= n
                 deductions.append(label)
 
-            if "spf=fail" in hdr:
+            failed = set(_AUTH_FAIL_RE.findall(hdr))
+            if "spf" in failed:
                 penalize("SPF failed in headers")
-            if "dkim=fail" in hdr:
+            if "dkim" in failed:
                 penalize("DKIM failed in headers")
-            if "dmarc=fail" in hdr:
+            if "dmarc" in failed:
                 penalize("DMARC failed in headers")
 
         # Body inspection
         if self.body:
             body = self.body.lower()
-            spam_words = settings.SPAM_KEYWORDS
-            matches = [w for w in spam_words if w in body]
+            matches = {keyword for _, keyword in _SPAM_AUTOMATON.iter(body)}
 
             if matches:
                 penalty = min(8, len(matches) * 2)
@@ -210,10 +234,12 @@ class TrustScorer:
         else:
             details.append("No content issues detected")
 
+        score = max(0, score)
+
         return {
-            "score": max(0, score),
+            "score": score,
             "max_score": max_score,
-            "percentage": round((max(0, score) / max_score) * 100, 1),
+            "percentage": round(score * self._CONTENT_INV, 1),
             "details": details,
             "risk_factors": deductions
         }
@@ -229,12 +255,11 @@ class TrustScorer:
         content = self.calculate_content_risk_score()
 
         total = auth["score"] + domain["score"] + send["score"] + content["score"]
-        max_total = auth["max_score"] + domain["max_score"] + send["max_score"] + content["max_score"]
 
         return {
             "total_score": total,
-            "max_score": max_total,
-            "trust_percentage": round((total / max_total) * 100, 1),
+            "max_score": self._TOTAL_MAX,
+            "trust_percentage": round(total * self._TOTAL_INV, 1),
             "authentication": auth,
             "domain_health": domain,
             "sending_setup": send,
@@ -6,6 +6,9 @@ HOST="${HOST:-0.0.0.0}"
 PORT="${PORT:-8000}"
 RELOAD="${RELOAD:-false}"
 
+# uvicorn's default --loop auto / --http auto already picks uvloop and httptools when
+# uvicorn[standard] installed them, and falls back where it didn't (e.g. no uvloop on Windows)
+
 echo "Starting SpamNoMore API..."
 echo "Host: $HOST"
 echo "Port: $PORT"
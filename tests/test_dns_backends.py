@@ -0,0 +1,140 @@
+import asyncio
+import socket
+import unittest
+
+import dns.exception
+import dns.flags
+import dns.message
+import dns.resolver
+
+from app.modules import dns_backends
+from app.modules.dns_backends import DNSPythonBackend, _UDPMultiplexer
+
+
+class FakeServer:
+    """A UDP socket on localhost that the test answers by hand."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setblocking(False)
+        self.sock.bind(("127.0.0.1", 0))
+        self.port = self.sock.getsockname()[1]
+
+    async def receive(self):
+        data, addr = await asyncio.get_running_loop().sock_recvfrom(self.sock, 65535)
+        return dns.message.from_wire(data), addr
+
+    def reply(self, response, addr):
+        self.sock.sendto(response.to_wire(), addr)
+
+    def close(self):
+        self.sock.close()
+
+
+class UDPMultiplexerTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = FakeServer()
+        self.multiplexer = _UDPMultiplexer(asyncio.get_running_loop())
+
+    async def asyncTearDown(self):
+        self.multiplexer.close()
+        self.server.close()
+
+    def query(self, request, timeout=1.0):
+        return asyncio.create_task(self.multiplexer.query(request, "127.0.0.1", self.server.port, timeout))
+
+    async def test_routes_reply_to_waiter(self):
+        request = dns.message.make_query("example.com", "TXT")
+        task = self.query(request)
+        received, addr = await self.server.receive()
+        self.server.reply(dns.message.make_response(received), addr)
+
+        response = await task
+        self.assertEqual(response.id, request.id)
+        self.assertEqual(self.multiplexer._pending, {})
+
+    async def test_redraws_colliding_query_id(self):
+        first = dns.message.make_query("a.example.com", "TXT")
+        second = dns.message.make_query("b.example.com", "TXT")
+        second.id = first.id
+
+        tasks = [self.query(first), self.query(second)]
+        received = [await self.server.receive() for _ in tasks]
+
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(len(self.multiplexer._pending), 2)
+        for message, addr in received:
+            self.server.reply(dns.message.make_response(message), addr)
+        responses = await asyncio.gather(*tasks)
+        self.assertEqual([r.question[0].name for r in responses], [first.question[0].name, second.question[0].name])
+
+    async def test_ignores_reply_with_other_question(self):
+        request = dns.message.make_query("example.com", "TXT")
+        task = self.query(request)
+        received, addr = await self.server.receive()
+
+        forged = dns.message.make_response(dns.message.make_query("evil.example", "TXT"))
+        forged.id = received.id
+        self.server.reply(forged, addr)
+        self.server.reply(dns.message.make_response(received), addr)
+
+        response = await task
+        self.assertEqual(str(response.question[0].name), "example.com.")
+
+    async def test_timeout_clears_pending(self):
+        with self.assertRaises(dns.exception.Timeout):
+            await self.query(dns.message.make_query("example.com", "TXT"), timeout=0.05)
+        self.assertEqual(self.multiplexer._pending, {})
+
+    async def test_close_fails_waiting_queries(self):
+        task = self.query(dns.message.make_query("example.com", "TXT"))
+        await self.server.receive()
+
+        self.multiplexer.close()
+        with self.assertRaises(ConnectionError):
+            await task
+        self.assertEqual(self.multiplexer._pending, {})
+
+    async def test_retired_socket_closes_after_last_query(self):
+        task = self.query(dns.message.make_query("example.com", "TXT"))
+        received, addr = await self.server.receive()
+
+        self.multiplexer.retire()
+        self.assertGreaterEqual(self.multiplexer._sock.fileno(), 0)
+        self.server.reply(dns.message.make_response(received), addr)
+        await task
+        self.assertLess(self.multiplexer._sock.fileno(), 0)
+
+
+class DNSPythonBackendTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = FakeServer()
+        self.backend = DNSPythonBackend(nameservers=("127.0.0.1",), port=self.server.port)
+
+    async def asyncTearDown(self):
+        self.backend.close()
+        self.server.close()
+
+    async def test_truncated_reply_without_tcp_raises_no_nameservers(self):
+        task = asyncio.create_task(self.backend.txt("example.com", 1.0))
+        received, addr = await self.server.receive()
+        response = dns.message.make_response(received)
+        response.flags |= dns.flags.TC
+        self.server.reply(response, addr)
+
+        with self.assertRaises(dns.resolver.NoNameservers):
+            await task
+
+    async def test_socket_rotates_after_max_queries(self):
+        first = self.backend._multiplexer()
+        first.queries = dns_backends.UDP_SOCKET_MAX_QUERIES
+
+        second = self.backend._multiplexer()
+        self.assertIsNot(first, second)
+        self.assertLess(first._sock.fileno(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
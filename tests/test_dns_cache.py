@@ -0,0 +1,86 @@
+import asyncio
+import unittest
+
+import dns.name
+import dns.resolver
+
+from app.modules import dns_cache
+from app.modules.dns_backends import DNSAnswer
+
+
+class AnswerTTLTest(unittest.TestCase):
+
+    def test_missing_or_negative_ttl_uses_default(self):
+        self.assertEqual(dns_cache._answer_ttl(DNSAnswer([], None)), dns_cache.DEFAULT_TTL)
+        self.assertEqual(dns_cache._answer_ttl(DNSAnswer([], -1)), dns_cache.DEFAULT_TTL)
+
+    def test_ttl_is_clamped(self):
+        self.assertEqual(dns_cache._answer_ttl(DNSAnswer([], 5)), dns_cache.MIN_TTL)
+        self.assertEqual(dns_cache._answer_ttl(DNSAnswer([], 120)), 120)
+        self.assertEqual(dns_cache._answer_ttl(DNSAnswer([], 86400)), dns_cache.MAX_TTL)
+
+
+class CachedResolveTest(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        dns_cache.clear()
+        self.calls = 0
+
+    def tearDown(self):
+        dns_cache.clear()
+
+    def lookup(self, result):
+        async def run():
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return run
+
+    async def test_answer_is_cached_case_insensitively(self):
+        answer = DNSAnswer([b"v=spf1 -all"], 300)
+        self.assertIs(await dns_cache.cached_resolve("Example.com", "TXT", self.lookup(answer)), answer)
+        self.assertIs(await dns_cache.cached_resolve("example.com", "TXT", self.lookup(answer)), answer)
+        self.assertEqual(self.calls, 1)
+
+    async def test_concurrent_misses_share_one_lookup(self):
+        answer = DNSAnswer([(10, "mx.example.com")], 300)
+        results = await asyncio.gather(*[
+            dns_cache.cached_resolve("example.com", "MX", self.lookup(answer)) for _ in range(5)
+        ])
+        self.assertEqual(self.calls, 1)
+        self.assertTrue(all(r is answer for r in results))
+        self.assertEqual(dns_cache._locks, {})
+
+    async def test_negative_answer_is_cached_and_raised_afresh(self):
+        qname = dns.name.from_text("missing.example.com")
+        lookup = self.lookup(dns.resolver.NXDOMAIN(qnames=[qname]))
+
+        errors = []
+        for _ in range(2):
+            with self.assertRaises(dns.resolver.NXDOMAIN) as raised:
+                await dns_cache.cached_resolve("missing.example.com", "TXT", lookup)
+            errors.append(raised.exception)
+
+        self.assertEqual(self.calls, 1)
+        self.assertIsNot(errors[0], errors[1])
+        self.assertEqual(errors[1].kwargs["qnames"], [qname])
+
+    async def test_no_answer_is_cached(self):
+        lookup = self.lookup(dns.resolver.NoAnswer())
+        for _ in range(2):
+            with self.assertRaises(dns.resolver.NoAnswer):
+                await dns_cache.cached_resolve("example.com", "TXT", lookup)
+        self.assertEqual(self.calls, 1)
+
+    async def test_other_errors_are_not_cached(self):
+        lookup = self.lookup(dns.resolver.NoNameservers())
+        for _ in range(2):
+            with self.assertRaises(dns.resolver.NoNameservers):
+                await dns_cache.cached_resolve("example.com", "TXT", lookup)
+        self.assertEqual(self.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
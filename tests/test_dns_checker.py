@@ -0,0 +1,88 @@
+import unittest
+
+from app.modules.dns import DNSChecker, _parse_dmarc
+
+
+class EvaluateSPFTest(unittest.TestCase):
+
+    def setUp(self):
+        self.checker = DNSChecker("example.com")
+
+    def test_terminal_qualifier(self):
+        cases = [
+            ("v=spf1 ip4:1.2.3.4 -all", True),
+            ("v=spf1 include:_spf.google.com ~all  ", True),
+            ("v=spf1 ?all", True),
+            # Modifiers may follow the all term (RFC 7208 section 5.1)
+            ("v=spf1 ip4:1.2.3.4 -all exp=explain.%{d}", True),
+            # "-all" inside another term is not an all term
+            ("v=spf1 include:foo-all.com", False),
+            ("v=spf1 ip4:1.2.3.4 -allx", False),
+            ("v=spf1 ip4:1.2.3.4", False),
+        ]
+        for record, valid in cases:
+            with self.subTest(record=record):
+                result = self.checker._evaluate_spf(record)
+                self.assertIs(result["valid"], valid)
+                self.assertEqual(
+                    "Missing terminal qualifier (-all, ~all, etc.)" in result["notes"], not valid
+                )
+
+    def test_redirect_needs_no_all_term(self):
+        result = self.checker._evaluate_spf("v=spf1 redirect=_spf.example.net")
+        self.assertTrue(result["valid"])
+        self.assertEqual(result["notes"], ["Redirect-based SPF detected (valid)"])
+
+
+class ParseDMARCTest(unittest.TestCase):
+
+    def test_tags(self):
+        cases = [
+            ("v=DMARC1; p=reject; rua=mailto:d@example.com",
+             {"v": "dmarc1", "p": "reject", "rua": "mailto:d@example.com"}),
+            # Whitespace around separators and '=' is trimmed
+            ("v=DMARC1;p = quarantine ;  sp=none", {"v": "dmarc1", "p": "quarantine", "sp": "none"}),
+            # The first occurrence of a repeated tag wins
+            ("v=DMARC1; p=none; p=reject", {"v": "dmarc1", "p": "none"}),
+            ("V=DMARC1; P=REJECT; SP=Quarantine", {"v": "dmarc1", "p": "reject", "sp": "quarantine"}),
+            ("v=DMARC1; p=reject;", {"v": "dmarc1", "p": "reject"}),
+            # Values containing '?' or '=' are kept whole
+            ("v=DMARC1; p=none; rua=mailto:d@example.com?subject=dmarc",
+             {"v": "dmarc1", "p": "none", "rua": "mailto:d@example.com?subject=dmarc"}),
+            ("v=DMARC1", {"v": "dmarc1"}),
+        ]
+        for record, tags in cases:
+            with self.subTest(record=record):
+                self.assertEqual(_parse_dmarc(record), tags)
+
+
+class InterpretDMARCTest(unittest.TestCase):
+
+    def setUp(self):
+        self.checker = DNSChecker("example.com")
+
+    def test_policy_modes(self):
+        cases = [
+            # record, policy, mode, rua, valid, notes
+            ("v=DMARC1; p=reject", "reject", "strict", None, True, []),
+            ("v=DMARC1; P = Quarantine", "quarantine", "enforcing", None, True, []),
+            ("v=DMARC1; p=none; rua=mailto:d@example.com?subject=x", "none", "monitoring",
+             "mailto:d@example.com?subject=x", True, ["Aggregate reporting enabled"]),
+            ("v=DMARC1; p=none; sp=reject;", "none", "partial-enforcement", None, True,
+             ["Subdomain policy enforced"]),
+            ("v=DMARC1; p=none; p=reject", "none", "monitoring", None, True, []),
+            ("v=DMARC1; p=bogus", "bogus", "unknown", None, False, ["Invalid DMARC policy"]),
+            ("v=DMARC1", None, "unknown", None, False, ["Invalid DMARC policy"]),
+        ]
+        for record, policy, mode, rua, valid, notes in cases:
+            with self.subTest(record=record):
+                result = self.checker._interpret_dmarc(record)
+                self.assertEqual(
+                    (result["policy"], result["mode"], result["rua"], result["valid"], result["notes"]),
+                    (policy, mode, rua, valid, notes)
+                )
+                self.assertEqual(result["record"], record)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+
+from pydantic import ValidationError
+
+from app.main import ScanDomainRequest
+from app.modules import DNSChecker
+
+
+class ValidateDomainTest(unittest.TestCase):
+
+    def test_strips_url_parts_and_lowercases(self):
+        self.assertEqual(ScanDomainRequest(domain="https://www.Example.com/path").domain, "example.com")
+
+    def test_strips_surrounding_whitespace(self):
+        for raw in ("example.com\n", " Example.com \t", "example.com\r\n"):
+            with self.subTest(raw=raw):
+                self.assertEqual(ScanDomainRequest(domain=raw).domain, "example.com")
+
+    def test_rejects_invalid_domains(self):
+        for raw in ("", "   ", "bad_domain", "exa\nmple.com", "example.com\nevil", "example"):
+            with self.subTest(raw=raw):
+                with self.assertRaises(ValidationError):
+                    ScanDomainRequest(domain=raw)
+
+    def test_validated_domain_is_accepted_by_dns_checker(self):
+        checker = DNSChecker(ScanDomainRequest(domain="gmail.com\n").domain)
+        self.assertTrue(checker.is_enterprise_domain())
+
+
+if __name__ == "__main__":
+    unittest.main()
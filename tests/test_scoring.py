@@ -0,0 +1,59 @@
+import unittest
+
+from app.modules.scoring import TrustScorer
+
+
+def dns_results(spf, dkim, dmarc_policy, dmarc_mode, mx_count):
+    return {
+        "spf": {"exists": spf is not None, "valid": bool(spf)},
+        "dkim": {"exists": dkim is not None, "valid": bool(dkim)},
+        "dmarc": {"exists": dmarc_policy is not None, "policy": dmarc_policy, "mode": dmarc_mode},
+        "mx": {"count": mx_count},
+    }
+
+
+class TrustScorerTest(unittest.TestCase):
+
+    def test_scores_match_baseline(self):
+        # Expected values were produced by the scorer before it was table-driven
+        cases = [
+            # spf, dkim, policy, mode, mx -> total, auth, domain, sending, auth details
+            ((True, True, "reject", "strict", 5), 88, 40, 20, 20,
+             ["SPF correctly configured", "DKIM signing detected", "DMARC enforcing (reject)"]),
+            ((True, True, "quarantine", "enforcing", 2), 80, 37, 20, 15,
+             ["SPF correctly configured", "DKIM signing detected", "DMARC enforcing (quarantine)"]),
+            ((True, True, "bogus", "unknown", 3), 70, 29, 18, 15,
+             ["SPF correctly configured", "DKIM signing detected", "Weak DMARC configuration"]),
+            ((True, False, "none", "monitoring", 2), 63, 22, 18, 15,
+             ["SPF correctly configured", "DKIM not detected", "DMARC monitoring only"]),
+            ((False, None, "none", "partial-enforcement", 1), 51, 18, 15, 10,
+             ["SPF exists but may be malformed", "DKIM not detected",
+              "DMARC partial enforcement (subdomains protected)"]),
+            ((None, None, None, "missing", 0), 8, 0, 0, 0,
+             ["SPF missing", "DKIM not detected", "DMARC missing"]),
+        ]
+        for args, total, auth, domain, sending, details in cases:
+            with self.subTest(args=args):
+                scorer = TrustScorer(dns_results(*args), "spf=fail dkim=fail", "free money winner")
+                result = scorer.calculate_overall_score()
+                self.assertEqual(result["total_score"], total)
+                self.assertEqual(result["trust_percentage"], float(total))
+                self.assertIsInstance(result["trust_percentage"], float)
+                self.assertEqual(result["authentication"]["score"], auth)
+                self.assertEqual(result["authentication"]["details"], details)
+                self.assertEqual(result["domain_health"]["score"], domain)
+                self.assertEqual(result["sending_setup"]["score"], sending)
+                self.assertEqual(
+                    result["content_risk"]["risk_factors"],
+                    ["SPF failed in headers", "DKIM failed in headers", "2 spam indicators"]
+                )
+
+    def test_percentages(self):
+        result = TrustScorer(dns_results(True, None, "none", "monitoring", 1)).calculate_overall_score()
+        self.assertEqual(result["authentication"]["percentage"], 55.0)
+        self.assertEqual(result["sending_setup"]["percentage"], 50.0)
+        self.assertEqual(result["max_score"], 100)
+
+
+if __name__ == "__main__":
+    unittest.main()